@@ -5,7 +5,9 @@ Handles embeddings, model initialization, and RAG query processing.
 
 import logging
 import os
+import threading
 import time
+from collections import OrderedDict
 from typing import List, Dict, Any, Optional, Tuple
 from langchain_openai import OpenAIEmbeddings, ChatOpenAI
 from langchain_postgres import PGVector
@@ -17,6 +19,11 @@ logger = logging.getLogger(__name__)
 
 # Constants
 TEMPERATURE = 0.2
+SEARCH_K = 3
+
+# Repeated questions reuse recent search results instead of re-embedding and re-searching
+SEARCH_CACHE_SIZE = 256
+SEARCH_CACHE_TTL_SECONDS = 600
 
 # PostgreSQL configuration
 from dotenv import load_dotenv
@@ -93,6 +100,9 @@ class OpenAIService:
         self.embedding_function = None
         self.model = None
         self.db = None
+        # (query_text, k) -> (cached_at, results), least recently used first
+        self._search_cache: "OrderedDict[Tuple[str, int], Tuple[float, List[Tuple]]]" = OrderedDict()
+        self._search_cache_lock = threading.Lock()
         self._initialize()
     
     def _initialize(self):
@@ -161,9 +171,9 @@ class OpenAIService:
         
         try:
             # Search the database
-            logger.info(f"Searching database with k=3...")
+            logger.info(f"Searching database with k={SEARCH_K}...")
             db_search_start_time = time.time()
-            results = self.db.similarity_search_with_relevance_scores(query_text, k=3)
+            results = self._search(query_text, SEARCH_K)
             db_search_end_time = time.time()
             db_search_time = db_search_end_time - db_search_start_time
             
@@ -221,6 +231,26 @@ class OpenAIService:
             logger.error(f"Embedding function status: {self.embedding_function is not None}")
             raise
     
+    def _search(self, query_text: str, k: int) -> List[Tuple]:
+        """Similarity search with relevance scores, served from a small TTL/LRU cache for repeated queries."""
+        key = (query_text, k)
+        now = time.monotonic()
+        with self._search_cache_lock:
+            cached = self._search_cache.get(key)
+            if cached and now - cached[0] < SEARCH_CACHE_TTL_SECONDS:
+                self._search_cache.move_to_end(key)
+                logger.info("Search results served from cache")
+                return cached[1]
+        
+        results = self.db.similarity_search_with_relevance_scores(query_text, k=k)
+        
+        with self._search_cache_lock:
+            self._search_cache[key] = (now, results)
+            self._search_cache.move_to_end(key)
+            while len(self._search_cache) > SEARCH_CACHE_SIZE:
+                self._search_cache.popitem(last=False)
+        return results
+    
     def _extract_sources(self, results: List[Tuple]) -> List[Optional[str]]:
         """Extract source filenames from search results."""
         sources = []
@@ -335,7 +365,7 @@ class OpenAIService:
             # Call OpenAI model
             logger.info("Calling OpenAI model...")
             openai_call_start_time = time.time()
-            response_text = self.model.predict(prompt)
+            response_text = self.model.invoke(prompt).content
             openai_call_end_time = time.time()
             openai_call_time = openai_call_end_time - openai_call_start_time
             
@@ -1,9 +1,10 @@
 # from langchain.document_loaders import DirectoryLoader
-from langchain_community.document_loaders import DirectoryLoader, TextLoader
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.schema import Document
 # from langchain.embeddings import OpenAIEmbeddings
 from langchain_openai import OpenAIEmbeddings
+from langchain.embeddings import CacheBackedEmbeddings
+from langchain.storage import LocalFileStore
 from langchain_postgres import PGVector
 from sqlalchemy import create_engine
 import openai
@@ -12,6 +13,7 @@ import re
 import shutil
 import time
 import random
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from dotenv import load_dotenv
 # Try both import locations for Markdown header splitter (depends on langchain version)
@@ -32,6 +34,11 @@ os.environ["API_KEY"] = API_KEY
 DATA_PATH = os.getenv('DATA_PATH', 'data')
 POSTGRES_CONNECTION_STRING = os.getenv('DATABASE_URL')
 COLLECTION_NAME = os.getenv('COLLECTION_NAME', 'pharma_documents')
+# Above this many files, reads are spread over a few threads (file I/O releases the GIL)
+PARALLEL_READ_MIN_FILES = 1000
+PARALLEL_READ_WORKERS = 8
+# Chunk embeddings are cached on disk by content hash, so a rebuild only embeds changed chunks
+EMBEDDING_CACHE_PATH = os.getenv('EMBEDDING_CACHE_PATH', '.embedding_cache')
 
 def main():
     # Validate required environment variables
@@ -51,14 +58,26 @@ def load_documents():
     """
     Load raw markdown so '#' and '##' remain in page_content.
     """
-    loader = DirectoryLoader(
-        DATA_PATH,
-        glob="**/*.md",
-        loader_cls=TextLoader,                    # <-- raw text, no markdown stripping
-        loader_kwargs={"encoding": "utf-8"},
-        use_multithreading=True,
-    )
-    documents = loader.load()
+    data_root = Path(DATA_PATH)
+    # Same files DirectoryLoader picked up: **/*.md, skipping hidden files and directories
+    paths = [
+        p for p in sorted(data_root.rglob("*.md"))
+        if not any(part.startswith(".") for part in p.relative_to(data_root).parts)
+    ]
+
+    def read(path: Path) -> str:
+        return path.read_bytes().decode("utf-8")  # <-- raw text, no markdown stripping
+
+    if len(paths) > PARALLEL_READ_MIN_FILES:
+        with ThreadPoolExecutor(max_workers=PARALLEL_READ_WORKERS) as executor:
+            contents = list(executor.map(read, paths))
+    else:
+        contents = [read(p) for p in paths]
+
+    documents = [
+        Document(page_content=content, metadata={"source": str(path)})
+        for path, content in zip(paths, contents)
+    ]
     return documents
 def split_text_by_markdown_headers(documents: list[Document]) -> list[Document]:
     """
@@ -131,24 +150,36 @@ def split_text_by_markdown_headers(documents: list[Document]) -> list[Document]:
         separators=["\n\n", "\n", " ", ""],
     )
 
+    # Split all over-length sections in a single call; each chunk carries its section's
+    # index so it can be mapped back to that section's metadata
+    long_idx = [i for i, sec in enumerate(all_section_docs) if len(sec.page_content) > 1400]
+    subchunks = section_chunker.create_documents(
+        [all_section_docs[i].page_content for i in long_idx],
+        metadatas=[{"section_idx": i} for i in long_idx],
+    )
+
+    subchunks_by_section: dict[int, list[Document]] = {i: [] for i in long_idx}
+    for sc in subchunks:
+        section_idx = sc.metadata["section_idx"]
+        sec = all_section_docs[section_idx]
+        # keep header metadata but flatten nested structures
+        sc.metadata = {
+            **sec.metadata,
+            "parent_h1": sec.metadata.get("h1", ""),
+            "parent_h2": sec.metadata.get("h2", ""),
+        }
+        # Keep the original content without prepending headers
+        # Header information is already in metadata
+        sc.page_content = sc.page_content.strip()
+        subchunks_by_section[section_idx].append(sc)
+
+    # Short sections stay whole; long ones are replaced by their sub-chunks, in document order
     final_chunks: list[Document] = []
-    for sec in all_section_docs:
-        if len(sec.page_content) <= 1400:
+    for i, sec in enumerate(all_section_docs):
+        if i in subchunks_by_section:
+            final_chunks.extend(subchunks_by_section[i])
+        else:
             final_chunks.append(sec)
-            continue
-
-        subchunks = section_chunker.split_documents([sec])
-        for sc in subchunks:
-            # keep header metadata but flatten nested structures
-            sc.metadata = {
-                **sec.metadata,
-                "parent_h1": sec.metadata.get("h1", ""),
-                "parent_h2": sec.metadata.get("h2", ""),
-            }
-            # Keep the original content without prepending headers
-            # Header information is already in metadata
-            sc.page_content = sc.page_content.strip()
-        final_chunks.extend(subchunks)
 
     print(f"Split {len(documents)} files into {len(all_section_docs)} header sections and {len(final_chunks)} final chunks.")
 
@@ -216,8 +247,13 @@ def save_to_postgres(chunks: list[Document]):
     """Save documents to PostgreSQL with pgvector extension."""
     print(f"Connecting to PostgreSQL database...")
     
-    # Initialize embeddings
-    embeddings = OpenAIEmbeddings(api_key=API_KEY)
+    # Initialize embeddings, cached per model so unchanged chunks skip the OpenAI API
+    openai_embeddings = OpenAIEmbeddings(api_key=API_KEY)
+    embeddings = CacheBackedEmbeddings.from_bytes_store(
+        openai_embeddings,
+        LocalFileStore(EMBEDDING_CACHE_PATH),
+        namespace=openai_embeddings.model,
+    )
     
     # Create database engine
     engine = create_engine(POSTGRES_CONNECTION_STRING)
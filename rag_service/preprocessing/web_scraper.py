@@ -1,32 +1,127 @@
 import argparse
 import os
 import re
+import threading
 import time
 import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import Iterable, List, Optional, Set, Tuple, Dict
 
 import requests
-from bs4 import BeautifulSoup, Tag
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Index/listing pages only need their links, so they use lxml when available (C parser,
+# several times faster than the pure-Python html.parser)
+try:
+    import lxml  # noqa: F401
+    _LINK_PARSER = "lxml"
+except ImportError:
+    _LINK_PARSER = "html.parser"
+
+# Medicine pages keep html.parser: their descriptions are <h3><p>...</p></h3>, and lxml
+# closes the <h3> at the <p>, which empties extract_drug_description
+_PAGE_PARSER = "html.parser"
 
 BASE_URL = "https://www.mp.pl/pacjent/leki/"
 MEDICINE_PATH_FRAGMENT = "/pacjent/leki/lek/"
 DATA_DIR = Path(__file__).resolve().parent / "data"
 
+# Patterns used in per-page/per-cell loops, compiled once
+_RE_WS = re.compile(r"[ \t]+")
+_RE_WS_NL = re.compile(r"\s+\n")
+_RE_ALL_WS = re.compile(r"\s+")
+_RE_PRICE = re.compile(r"([\d,]+)\s*zł")
+_RE_NONASCII_SLUG = re.compile(r"[^A-Za-z0-9\-_. ]+")
+_RE_SEMI = re.compile(r";+")
+# Source URL line written by convert_article_to_markdown
+_RE_SOURCE = re.compile(r"^## Źródło\n(\S+)", re.M)
+# Spaces/tabs collapse to one space; 3+ newlines compact to a blank line
+_RE_CELL_WS = re.compile(r"[ \t]+|(\n{3,})")
+# Non-breaking space -> space, zero-width space removed
+_SPACE_TRANS = str.maketrans({"\xa0": " ", "\u200b": ""})
+_RE_INNE = re.compile(r"^inne\s+preparaty.*zawierające", re.I)
+
+# Header -> canonical column classification in a single match. Each alternative is a
+# lookahead tried in order from the start of the string, so earlier rules keep priority.
+_CANON_RE = re.compile(
+    r"(?P<nazwa>(?=.*nazwa))"
+    r"|(?P<postac>(?=postac|.*dawka|.*opakowanie))"
+    r"|(?P<producent>(?=.*producent))"
+    r"|(?P<cena100>(?=.*cena 100|cena(?!.*refund)))"
+    r"|(?P<refundacja>(?=.*refundac))"
+)
+_CANON_KEYS = {
+    "nazwa": "nazwa preparatu",
+    "postac": "postać; dawka; opakowanie",
+    "producent": "producent",
+    "cena100": "cena 100%",
+    "refundacja": "cena po refundacji",
+}
+
 
 # ----------------------------- HTTP -----------------------------
 
-def fetch_html(url: str, timeout: int = 20) -> str:
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
-            " AppleWebKit/537.36 (KHTML, like Gecko)"
-            " Chrome/126.0 Safari/537.36"
-        )
-    }
-    resp = requests.get(url, headers=headers, timeout=timeout)
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
+    " AppleWebKit/537.36 (KHTML, like Gecko)"
+    " Chrome/126.0 Safari/537.36"
+)
+
+
+DEFAULT_POOL_MAXSIZE = 16
+
+
+def _mount_adapter(session: requests.Session, pool_maxsize: int) -> None:
+    """(Re)mount the pooling adapter; pool_maxsize must cover the number of concurrent workers."""
+    retries = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize, max_retries=retries)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+
+def _build_session(pool_maxsize: int = DEFAULT_POOL_MAXSIZE) -> requests.Session:
+    """Session with keep-alive connection pooling and retries for transient errors."""
+    session = requests.Session()
+    session.headers.update({"User-Agent": USER_AGENT, "Accept-Encoding": "gzip, deflate"})
+    _mount_adapter(session, pool_maxsize)
+    return session
+
+
+# Shared by every request so all pages of www.mp.pl reuse pooled TCP/TLS connections
+_SESSION = _build_session()
+
+
+def fetch_html(url: str, timeout: int = 20) -> Tuple[bytes, Optional[str]]:
+    """Fetch a page as raw (decompressed) bytes plus the charset from its Content-Type, if any.
+
+    The bytes go straight to the parser, which decodes them itself; without a declared
+    charset the parser sniffs the page's <meta charset> instead of assuming ISO-8859-1.
+    """
+    resp = _SESSION.get(url, timeout=timeout)
     resp.raise_for_status()
-    return resp.text
+    declared = "charset" in resp.headers.get("Content-Type", "").lower()
+    return resp.content, (resp.encoding if declared else None)
+
+
+class RateLimiter:
+    """Spaces request starts at least `interval` seconds apart across threads."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.interval
+        if start > now:
+            time.sleep(start - now)
 
 
 def absolute_url(href: str) -> Optional[str]:
@@ -45,10 +140,16 @@ def absolute_url(href: str) -> Optional[str]:
 
 # --------------------------- Discovery --------------------------
 
-def discover_letter_pages(index_html: str) -> List[str]:
-    soup = BeautifulSoup(index_html, "html.parser")
+# Discovery only needs links, so listing/index pages are parsed into just these nodes
+# (each kept with its subtree) instead of the whole DOM
+_ANCHOR_STRAINER = SoupStrainer("a", href=True)
+_LISTING_STRAINER = SoupStrainer(["ul", "a"])
+
+
+def discover_letter_pages(index_html: bytes, encoding: Optional[str] = None) -> List[str]:
+    soup = BeautifulSoup(index_html, _LINK_PARSER, parse_only=_ANCHOR_STRAINER, from_encoding=encoding)
     candidate_urls: Set[str] = set()
-    for a in soup.find_all("a"):
+    for a in soup.find_all("a", href=True):
         href = a.get("href")
         url = absolute_url(href)
         if not url:
@@ -60,8 +161,8 @@ def discover_letter_pages(index_html: str) -> List[str]:
     return sorted(set(prioritized))
 
 
-def extract_medicine_links(listing_html: str) -> List[str]:
-    soup = BeautifulSoup(listing_html, "html.parser")
+def extract_medicine_links(listing_html: bytes, encoding: Optional[str] = None) -> List[str]:
+    soup = BeautifulSoup(listing_html, _LINK_PARSER, parse_only=_LISTING_STRAINER, from_encoding=encoding)
     links: Set[str] = set()
     for ul in soup.select("ul.list-unstyled.drug-list"):
         for a in ul.find_all("a", href=True):
@@ -81,21 +182,25 @@ def extract_medicine_links(listing_html: str) -> List[str]:
 def slugify(filename: str) -> str:
     normalized = unicodedata.normalize("NFKD", filename)
     ascii_only = normalized.encode("ascii", "ignore").decode("ascii")
-    cleaned = re.sub(r"[^A-Za-z0-9\-_. ]+", "", ascii_only).strip()
-    cleaned = re.sub(r"[\s]+", "_", cleaned)
+    cleaned = _RE_NONASCII_SLUG.sub("", ascii_only).strip()
+    cleaned = _RE_ALL_WS.sub("_", cleaned)
     cleaned = cleaned.strip("._")
     return cleaned or "medicine"
 
 
 def clean_text(s: str) -> str:
-    s = s.replace("\xa0", " ").replace("\u200b", "")
-    s = re.sub(r"[ \t]+", " ", s)
-    s = re.sub(r"\s+\n", "\n", s)
+    s = s.translate(_SPACE_TRANS)
+    s = _RE_WS.sub(" ", s)
+    s = _RE_WS_NL.sub("\n", s)
     return s.strip()
 
 
 # ---------------------- Structure-aware parsing -----------------
 
+def parse_medicine_page(html: bytes, encoding: Optional[str] = None) -> BeautifulSoup:
+    return BeautifulSoup(html, _PAGE_PARSER, from_encoding=encoding)
+
+
 def extract_main_container(soup: BeautifulSoup) -> Tag:
     cont = soup.select_one("div.drug-description")
     if cont:
@@ -107,32 +212,31 @@ def extract_main_container(soup: BeautifulSoup) -> Tag:
     return soup.body or soup
 
 
+# Header strings repeat on every row of every page, so both helpers are memoized
+@lru_cache(maxsize=2048)
 def _norm(s: str) -> str:
     """Lowercase, strip, collapse spaces, remove diacritics."""
     if s is None:
         return ""
-    s = s.replace("\xa0", " ").strip()
-    s = re.sub(r"\s+", " ", s)
+    s = s.translate(_SPACE_TRANS).strip()
+    s = _RE_ALL_WS.sub(" ", s)
+    # ASCII text has nothing to decompose or strip
+    if s.isascii():
+        return s.lower()
     s = unicodedata.normalize("NFKD", s)
     s = "".join(ch for ch in s if not unicodedata.combining(ch))
     return s.lower()
 
 
+@lru_cache(maxsize=2048)
 def _canon_key(s: str) -> str:
     """Map various header spellings/typos to canonical keys."""
     s = _norm(s).rstrip(":")
     # handle common variants / typos
     s = s.replace("refudacji", "refundacji")   # site typo
-    if "nazwa" in s:
-        return "nazwa preparatu"
-    if s.startswith("postac") or "dawka" in s or "opakowanie" in s:
-        return "postać; dawka; opakowanie"
-    if "producent" in s:
-        return "producent"
-    if "cena 100" in s or (s.startswith("cena") and "refund" not in s):
-        return "cena 100%"
-    if "refundac" in s:
-        return "cena po refundacji"
+    m = _CANON_RE.match(s)
+    if m:
+        return _CANON_KEYS[m.lastgroup]
     return s  # fallback
 
 
@@ -158,11 +262,11 @@ def _cell_text(td: Tag) -> str:
                 price_text = link.get_text(separator=" ", strip=True)
                 if price_text:
                     # Clean up the price text - remove extra whitespace and newlines
-                    price_text = re.sub(r'\s+', ' ', price_text).strip()
+                    price_text = _RE_ALL_WS.sub(' ', price_text).strip()
                     # Only keep the price part (before any additional text)
                     if 'zł' in price_text:
                         # Extract just the price and currency
-                        price_match = re.search(r'([\d,]+)\s*zł', price_text)
+                        price_match = _RE_PRICE.search(price_text)
                         if price_match:
                             prices.append(f"{price_match.group(1)} zł")
                         else:
@@ -174,17 +278,27 @@ def _cell_text(td: Tag) -> str:
     
     # Preserve line breaks between inline blocks; collapse excessive spaces
     text = target.get_text(separator="\n", strip=True)
-    text = text.replace("\xa0", " ")
-    # compact multiple blank lines
-    text = re.sub(r"\n{3,}", "\n\n", text)
-    text = re.sub(r"[ \t]+", " ", text)
+    text = text.translate(_SPACE_TRANS)
+    # compact multiple blank lines and runs of spaces in one pass
+    text = _RE_CELL_WS.sub(lambda m: "\n\n" if m.group(1) else " ", text)
     return text.strip()
 
 
+# Canonical table columns in render order; parsed tables always list these first
+CANON_COLS = [
+    "nazwa preparatu",
+    "postać; dawka; opakowanie",
+    "producent",
+    "cena 100%",
+    "cena po refundacji",
+]
+
+
 def parse_table_responsive(container: Tag) -> Dict[str, object]:
     """
     Parse the .table-responsive grid into:
-      { "headers": [canon...], "rows": [ {canon_col: value, ...}, ... ] }
+      { "headers": [canon..., extras...], "rows": [ (value per header), ... ] }
+    Rows are tuples aligned with headers ("" for missing cells).
     Robust to: .table-postaci, div-cell wrappers, data-title, typos.
     """
     out = {"headers": [], "rows": []}
@@ -204,51 +318,47 @@ def parse_table_responsive(container: Tag) -> Dict[str, object]:
         headers_raw = [th.get_text(" ", strip=True) for th in ths]
 
     headers_canon = [_canon_key(h) for h in headers_raw] if headers_raw else []
+    # Column key per cell index, resolved once for all rows (None: fall back to data-title)
+    idx_to_key: List[Optional[str]] = [k or None for k in headers_canon]
+    len_idx = len(idx_to_key)
+
+    # Column position per key: canonical columns first, extras appended as first seen
+    col_pos: Dict[str, int] = {k: i for i, k in enumerate(CANON_COLS)}
 
     # 2) rows from tbody
+    rows: List[List[Optional[str]]] = []
     tbody = table.find("tbody") or table
     for tr in tbody.find_all("tr"):
         tds = tr.find_all("td")
         if not tds:
             continue
 
-        row: Dict[str, str] = {}
+        row: List[Optional[str]] = [None] * len(col_pos)
         for idx, td in enumerate(tds):
             # prefer header by index; else use data-title for that cell
-            key = ""
-            if idx < len(headers_canon) and headers_canon[idx]:
-                key = headers_canon[idx]
-            else:
-                key = _canon_key(td.get("data-title", ""))
+            key = idx_to_key[idx] if idx < len_idx else None
+            if key is None:
+                key = _canon_key(td.get("data-title", "")) or f"col_{idx}"
 
             val = _cell_text(td)
-            if not key:
-                # still try data-title
-                key = _canon_key(td.get("data-title", "")) or f"col_{idx}"
+
+            pos = col_pos.get(key)
+            if pos is None:
+                pos = col_pos[key] = len(col_pos)
+                row.append(None)
 
             # merge if duplicate keys (rare): join with newline
-            if key in row and val:
-                row[key] = (row[key] + "\n" + val).strip()
+            if row[pos] is not None and val:
+                row[pos] = (row[pos] + "\n" + val).strip()
             else:
-                row[key] = val
-
-        out["rows"].append(row)
-
-    # Ensure canonical header order for rendering later
-    canon_cols = [
-        "nazwa preparatu",
-        "postać; dawka; opakowanie",
-        "producent",
-        "cena 100%",
-        "cena po refundacji",
-    ]
-    # Build final headers list: keep canonical first, then any extras we saw
-    seen_extra = [k for r in out["rows"] for k in r.keys() if k not in canon_cols]
-    extras_ordered = []
-    for k in seen_extra:
-        if k not in extras_ordered:
-            extras_ordered.append(k)
-    out["headers"] = canon_cols + extras_ordered
+                row[pos] = val
+
+        rows.append(row)
+
+    # Pad rows to the final width; extras found in later rows are missing from earlier ones
+    width = len(col_pos)
+    out["headers"] = list(col_pos)
+    out["rows"] = [tuple(v or "" for v in row) + ("",) * (width - len(row)) for row in rows]
     return out
 
 
@@ -256,40 +366,33 @@ def _md_escape_pipes(s: str) -> str:
     return s.replace("|", r"\|")
 
 
+def _clean_cell(val: str) -> str:
+    """Flatten a cell value onto one markdown table line, escaping pipes."""
+    if not val:
+        return ""
+    # Replace newlines with semicolons for better readability in markdown tables
+    if "\n" in val:
+        val = val.replace("\n", "; ")
+    # Clean up multiple semicolons and spaces; most cells have neither, so skip the regexes.
+    # isprintable() is False for any whitespace other than a plain space.
+    if ";;" in val:
+        val = _RE_SEMI.sub(";", val)
+    if "  " in val or not val.isprintable():
+        val = _RE_ALL_WS.sub(" ", val)
+    return _md_escape_pipes(val.strip("; "))
+
+
 def render_price_table(table_data: Dict[str, object]) -> str:
     rows = table_data.get("rows", [])
     if not rows:
         return ""
 
     # We will render only the canonical 5 columns (others can be appended if needed)
-    cols = [
-        "nazwa preparatu",
-        "postać; dawka; opakowanie",
-        "producent",
-        "cena 100%",
-        "cena po refundacji",
-    ]
+    cols = CANON_COLS
     header = " | ".join([c.title() if c != "postać; dawka; opakowanie" else "Postać; dawka; opakowanie" for c in cols])
 
-    lines = []
-    for r in rows:
-        line_vals = []
-        for c in cols:
-            val = r.get(c, "")
-            # Clean up the value for markdown table
-            if val:
-                # Replace newlines with semicolons for better readability in markdown tables
-                val = val.replace("\n", "; ")
-                # Clean up multiple semicolons and spaces
-                val = re.sub(r';+', ';', val)
-                val = re.sub(r'\s+', ' ', val).strip()
-                val = val.strip('; ')
-            # Escape pipes for markdown
-            val = _md_escape_pipes(val)
-            line_vals.append(val)
-        lines.append(" | ".join(line_vals))
-
-    return header + "\n" + "\n".join(lines) + "\n\n"
+    body = "\n".join(" | ".join(_clean_cell(val) for val in r[:len(cols)]) for r in rows)
+    return header + "\n" + body + "\n\n"
 
 
 def h1_title(soup: BeautifulSoup, parsed_name: str) -> str:
@@ -302,15 +405,11 @@ def h1_title(soup: BeautifulSoup, parsed_name: str) -> str:
 
 
 def render_unique_list(items: List[str]) -> str:
-    seen = set()
-    out = []
-    for it in items:
-        it = it.strip()
-        if not it or it in seen:
-            continue
-        seen.add(it)
-        out.append(f"- {it}")
-    return "\n".join(out) + ("\n\n" if out else "")
+    # dict.fromkeys dedupes while keeping first-seen order
+    uniq = dict.fromkeys(it for it in (item.strip() for item in items) if it)
+    if not uniq:
+        return ""
+    return "\n".join(f"- {it}" for it in uniq) + "\n\n"
 
 
 def extract_drug_description(container: Tag) -> str:
@@ -351,8 +450,8 @@ def convert_article_to_markdown(soup: BeautifulSoup, source_url: str) -> Tuple[s
     # derive title
     first_name = ""
     if table.get("rows"):
-        r0 = table["rows"][0]
-        first_name = r0.get("nazwa preparatu") or r0.get("nazwa") or ""
+        # "nazwa preparatu" is always the first column
+        first_name = table["rows"][0][0]
     title = h1_title(soup, first_name)
 
     md_parts: List[str] = [f"# {title}\n\n"]
@@ -376,10 +475,15 @@ def convert_article_to_markdown(soup: BeautifulSoup, source_url: str) -> Tuple[s
 
     # Other content sections: each <h2> + nearest .item-content
     h2_count = 0
+    other_h2 = None
+    other_heading = ""
     for h2 in container.find_all("h2"):
         heading = clean_text(h2.get_text(" ", strip=True))
-        # skip the "Inne preparaty..." here; handle later - but be specific to avoid matching other sections
-        if re.search(r"^inne\s+preparaty.*zawierające", heading, flags=re.I):
+        # keep the first "Inne preparaty..." heading for the links section below - but be specific
+        # to avoid matching other sections
+        if _RE_INNE.search(heading):
+            if other_h2 is None:
+                other_h2, other_heading = h2, heading
             continue
 
         h2_count += 1
@@ -397,30 +501,21 @@ def convert_article_to_markdown(soup: BeautifulSoup, source_url: str) -> Tuple[s
             # If we found one, check if it's actually associated with this h2
             # by making sure there are no other h2 elements between this h2 and the content div
             if content_div:
-                # Check if there are any h2 elements between this h2 and the content div
-                current = h2.next_sibling
-                while current and current != content_div:
-                    if current.name == "h2":
-                        # Found another h2 before the content div, so this content isn't for us
+                if content_div.parent is h2.parent:
+                    # Sibling div: the closest h2 before it must be this one
+                    if content_div.find_previous_sibling("h2") is not h2:
                         content_div = None
-                        break
-                    current = current.next_sibling
+                elif h2.find_next_sibling("h2") is not None:
+                    # Nested div: any later h2 sibling claims it instead
+                    content_div = None
 
         body = clean_text(content_div.get_text("\n", strip=True)) if content_div else ""
         if heading:
             md_parts.append(f"## {heading}\n\n")
             if body:
                 md_parts.append(body + "\n\n")
-    
-
 
     # Inne preparaty … (links)
-    other_h2 = None
-    for h2 in container.find_all("h2"):
-        h2_text = h2.get_text(" ", strip=True)
-        if re.search(r"^inne\s+preparaty.*zawierające", h2_text, flags=re.I):
-            other_h2 = h2
-            break
     if other_h2:
         plist = other_h2.find_next("p", class_="other-drugs")
         links = []
@@ -431,8 +526,7 @@ def convert_article_to_markdown(soup: BeautifulSoup, source_url: str) -> Tuple[s
                 if txt and url:
                     links.append(f"- [{txt}]({url})")
         if links:
-            heading = clean_text(other_h2.get_text(" ", strip=True))
-            md_parts.append("## " + heading + "\n\n")
+            md_parts.append("## " + other_heading + "\n\n")
             md_parts.append("\n".join(links) + "\n\n")
 
     markdown = "".join(md_parts).strip() + "\n"
@@ -445,29 +539,69 @@ def save_markdown(title: str, markdown: str) -> Path:
     DATA_DIR.mkdir(parents=True, exist_ok=True)
     filename = slugify(title) + ".md"
     path = DATA_DIR / filename
-    path.write_text(markdown, encoding="utf-8")
+    path.write_bytes(markdown.encode("utf-8"))
     return path
 
 
+def saved_source_urls() -> Set[str]:
+    """Source URLs of the pages already saved in DATA_DIR, read from each file's "## Źródło" section."""
+    urls: Set[str] = set()
+    if not DATA_DIR.exists():
+        return urls
+    for path in DATA_DIR.glob("*.md"):
+        try:
+            match = _RE_SOURCE.search(path.read_text(encoding="utf-8"))
+        except (OSError, UnicodeDecodeError):
+            continue
+        if match:
+            urls.add(match.group(1))
+    return urls
+
+
 # --------------------------- Orchestration ----------------------
 
+def _process_medicine_page(url: str, idx: int, total: int, overwrite: bool, limiter: RateLimiter) -> bool:
+    """Fetch, convert and save one medicine page; returns True if a file was written."""
+    try:
+        limiter.wait()
+        html, encoding = fetch_html(url)
+        soup = parse_medicine_page(html, encoding)
+
+        # Title for filename; we'll also re-derive inside convert for correctness
+        page_h1 = soup.find("h1")
+        prelim_title = clean_text(page_h1.get_text(" ", strip=True)) if page_h1 else f"medicine_{idx}"
+        filepath = DATA_DIR / (slugify(prelim_title) + ".md")
+        if filepath.exists() and not overwrite:
+            print(f"[{idx}/{total}] SKIP exists: {filepath.name}")
+            return False
+
+        title, md = convert_article_to_markdown(soup, url)
+        saved_path = save_markdown(title, md)
+        print(f"[{idx}/{total}] Saved: {saved_path.name}")
+        return True
+    except Exception as e:
+        print(f"[WARN] Failed to process {url}: {e}")
+        return False
+
+
 def scrape_all(
     sleep_between_requests: float = 0.5,
     overwrite: bool = False,
     limit: Optional[int] = None,
+    workers: int = 8,
 ) -> None:
     print("Fetching index page …")
-    index_html = fetch_html(BASE_URL)
+    index_html, index_encoding = fetch_html(BASE_URL)
 
-    letter_pages = discover_letter_pages(index_html) or [BASE_URL]
+    letter_pages = discover_letter_pages(index_html, index_encoding) or [BASE_URL]
     print(f"Discovered {len(letter_pages)} listing pages")
 
     medicine_links: List[str] = []
     seen: Set[str] = set()
     for i, listing_url in enumerate(letter_pages, start=1):
         try:
-            html = fetch_html(listing_url)
-            links = extract_medicine_links(html)
+            html, encoding = fetch_html(listing_url)
+            links = extract_medicine_links(html, encoding)
             new_links = [u for u in links if u not in seen]
             seen.update(new_links)
             medicine_links.extend(new_links)
@@ -479,30 +613,32 @@ def scrape_all(
     if limit is not None:
         medicine_links = medicine_links[: max(0, int(limit))]
 
-    print(f"Scraping {len(medicine_links)} medicine pages…")
+    # Skip pages already on disk before fetching them; filenames come from the page <h1>,
+    # so match on the source URL recorded in each saved file instead
+    if not overwrite:
+        already_saved = saved_source_urls()
+        pending = [u for u in medicine_links if u not in already_saved]
+        if len(pending) < len(medicine_links):
+            print(f"Skipping {len(medicine_links) - len(pending)} pages already saved")
+        medicine_links = pending
 
-    count = 0
-    for idx, url in enumerate(medicine_links, start=1):
-        try:
-            html = fetch_html(url)
-            soup = BeautifulSoup(html, "html.parser")
-
-            # Title for filename; we'll also re-derive inside convert for correctness
-            page_h1 = soup.find("h1")
-            prelim_title = clean_text(page_h1.get_text(" ", strip=True)) if page_h1 else f"medicine_{idx}"
-            filepath = DATA_DIR / (slugify(prelim_title) + ".md")
-            if filepath.exists() and not overwrite:
-                print(f"[{idx}/{len(medicine_links)}] SKIP exists: {filepath.name}")
-                continue
-
-            title, md = convert_article_to_markdown(soup, url)
-            saved_path = save_markdown(title, md)
-            count += 1
-            print(f"[{idx}/{len(medicine_links)}] Saved: {saved_path.name}")
-        except Exception as e:
-            print(f"[WARN] Failed to process {url}: {e}")
-        finally:
-            time.sleep(sleep_between_requests)
+    print(f"Scraping {len(medicine_links)} medicine pages with {workers} workers…")
+
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    # Requests overlap across workers, but still start at most one per sleep interval
+    limiter = RateLimiter(sleep_between_requests)
+    workers = max(1, workers)
+    # Size the connection pool for the worker count, or urllib3 discards connections
+    # ("Connection pool is full") and keep-alive reuse silently degrades
+    if workers > DEFAULT_POOL_MAXSIZE:
+        _mount_adapter(_SESSION, workers)
+    total = len(medicine_links)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        saved = executor.map(
+            lambda item: _process_medicine_page(item[1], item[0], total, overwrite, limiter),
+            enumerate(medicine_links, start=1),
+        )
+        count = sum(saved)
 
     print(f"Done. New/updated files: {count}")
 
@@ -512,12 +648,14 @@ def main():
     parser.add_argument("--sleep", type=float, default=0.5, help="Seconds to sleep between requests")
     parser.add_argument("--overwrite", action="store_true", help="Overwrite existing .md files")
     parser.add_argument("--limit", type=int, default=None, help="Limit number of medicines to scrape")
+    parser.add_argument("--workers", type=int, default=8, help="Number of medicine pages fetched concurrently")
     args = parser.parse_args()
 
     scrape_all(
         sleep_between_requests=args.sleep,
         overwrite=args.overwrite,
         limit=args.limit,
+        workers=args.workers,
     )
 
 
@@ -8,13 +8,14 @@ import os
 import logging
 import time
 import re
+import string
 import unicodedata
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 import uvicorn
 
 # Import our modules
@@ -28,6 +29,13 @@ logger = logging.getLogger(__name__)
 # Constants
 TEMPERATURE = 0.2
 
+# Maximum number of medicine names accepted by POST /documents/batch
+MAX_DOCUMENT_BATCH_SIZE = 50
+
+# Number of uvicorn worker processes. Each worker initializes its own services
+# (OpenAI client, PGVector engine, medicine names index), so scale up explicitly.
+WORKERS = int(os.getenv("WORKERS", "1"))
+
 # PostgreSQL configuration
 from dotenv import load_dotenv
 load_dotenv()
@@ -47,6 +55,26 @@ if API_KEY:
 else:
     logger.warning("API_KEY not found in environment variables")
 
+# Single translate table for normalize_document_name: maps Polish letters to
+# lowercase ASCII, drops ł/Ł, lowercases ASCII letters and turns every other
+# ASCII character outside [a-z0-9.+-] (including "/") into an underscore.
+_NORMALIZE_TABLE = {
+    **{
+        code: '_' for code in range(128)
+        if not (chr(code).isalnum() or chr(code) in '.+-')
+    },
+    **{ord(c): ord(c.lower()) for c in string.ascii_uppercase},
+    **str.maketrans({
+        'ą': 'a', 'ć': 'c', 'ę': 'e', 'ń': 'n', 'ó': 'o', 'ś': 's', 'ź': 'z', 'ż': 'z',
+        'Ą': 'a', 'Ć': 'c', 'Ę': 'e', 'Ń': 'n', 'Ó': 'o', 'Ś': 's', 'Ź': 'z', 'Ż': 'z',
+        'ł': None, 'Ł': None,
+    }),
+}
+# ASCII characters that normalize to "_" and are stripped from the start of a name
+_NAME_SEPARATORS = ''.join(chr(code) for code, value in _NORMALIZE_TABLE.items() if value == '_')
+_INVALID_NAME_CHARS_RE = re.compile(r'[^a-z0-9.+\-]')
+_UNDERSCORES_RE = re.compile(r'_+')
+
 def normalize_document_name(name: str) -> str:
     """
     Normalize document name by handling Polish characters and special characters.
@@ -65,38 +93,20 @@ def normalize_document_name(name: str) -> str:
     Returns:
         Normalized document name
     """
-    # Polish character mappings (excluding ł which should be removed)
-    polish_mappings = {
-        'ą': 'a', 'ć': 'c', 'ę': 'e', 'ń': 'n', 'ó': 'o', 'ś': 's', 'ź': 'z', 'ż': 'z',
-        'Ą': 'A', 'Ć': 'C', 'Ę': 'E', 'Ń': 'N', 'Ó': 'O', 'Ś': 'S', 'Ź': 'Z', 'Ż': 'Z'
-    }
-    
-    # Apply Polish character mappings first (before any normalization)
-    normalized = name
-    for polish_char, replacement in polish_mappings.items():
-        normalized = normalized.replace(polish_char, replacement)
+    # Polish mapping, ł removal, lowercasing and ASCII punctuation in one pass
+    normalized = name.translate(_NORMALIZE_TABLE)
     
-    # Remove ł and Ł entirely
-    normalized = normalized.replace('ł', '').replace('Ł', '')
-    
-    # Now normalize unicode characters (after Polish character replacement)
-    normalized = unicodedata.normalize('NFD', normalized)
-    
-    # Convert forward slashes to underscores first
-    normalized = normalized.replace('/', '_')
-    
-    # Replace all remaining non-alphanumeric characters (except dots and plus signs) with underscore
-    normalized = re.sub(r'[^a-zA-Z0-9.+\-]', '_', normalized)
+    # Only other non-ASCII characters still need unicode decomposition
+    if not normalized.isascii():
+        normalized = unicodedata.normalize('NFD', normalized.lower())
+        normalized = _INVALID_NAME_CHARS_RE.sub('_', normalized)
     
     # Remove multiple consecutive underscores
-    normalized = re.sub(r'_+', '_', normalized)
+    normalized = _UNDERSCORES_RE.sub('_', normalized)
     
     # Remove leading and trailing underscores
     normalized = normalized.strip('_')
     
-    # Convert to lowercase
-    normalized = normalized.lower()
-    
     return normalized
 
 # FastAPI app initialization
@@ -106,15 +116,22 @@ app = FastAPI(
     version="1.0.0"
 )
 
-# Add CORS middleware - Updated to be more explicit
+# Origins allowed to call the API from a browser
+ALLOWED_ORIGINS = [
+    "https://pharmarag.eu",
+    "https://www.pharmarag.eu",
+    "http://localhost:3000",
+    "http://localhost:3001",
+]
+
+# Paths polled by load balancers; skipped by the request logging middleware
+UNLOGGED_PATHS = frozenset({"/health", "/test-cors"})
+
+# Add CORS middleware - Updated to be more explicit.
+# It also answers preflight OPTIONS requests, so no per-route OPTIONS handlers are needed.
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=[
-        "https://pharmarag.eu",
-        "https://www.pharmarag.eu",
-        "http://localhost:3000",
-        "http://localhost:3001",
-    ],
+    allow_origins=ALLOWED_ORIGINS,
     allow_credentials=True,
     allow_methods=["GET", "POST", "OPTIONS", "PUT", "DELETE", "PATCH"],
     allow_headers=["*"],
@@ -165,6 +182,13 @@ class DocumentResponse(BaseModel):
     h2: Optional[str] = None
     content: Optional[str] = None
 
+class DocumentBatchRequest(BaseModel):
+    names: List[str] = Field(..., max_length=MAX_DOCUMENT_BATCH_SIZE)
+
+class DocumentBatchResponse(BaseModel):
+    results: List[DocumentResponse]
+    not_found: List[str]
+
 # Global service instances
 openai_service = None
 medicine_names_service = None
@@ -172,25 +196,23 @@ medicine_names_service = None
 # Middleware to log all requests and ensure CORS headers
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
+    # Health checks and CORS probes are hit constantly; don't time or log them,
+    # but still give them the same CORS header fallback as every other route
+    log_request = request.url.path not in UNLOGGED_PATHS
     start_time = time.time()
     
     # Log request details
-    logger.info(f"Request: {request.method} {request.url}")
-    logger.info(f"Request origin: {request.headers.get('origin', 'no origin header')}")
+    if log_request:
+        logger.info(f"Request: {request.method} {request.url}")
+        logger.info(f"Request origin: {request.headers.get('origin', 'no origin header')}")
     
     # Process the request
     response = await call_next(request)
     
     # Explicitly add CORS headers as a fallback (in case middleware doesn't work)
     origin = request.headers.get("origin")
-    allowed_origins = [
-        "https://pharmarag.eu",
-        "https://www.pharmarag.eu",
-        "http://localhost:3000",
-        "http://localhost:3001",
-    ]
-    
-    if origin in allowed_origins:
+    
+    if origin in ALLOWED_ORIGINS:
         response.headers["Access-Control-Allow-Origin"] = origin
         response.headers["Access-Control-Allow-Credentials"] = "true"
         response.headers["Access-Control-Allow-Methods"] = "GET, POST, OPTIONS, PUT, DELETE, PATCH"
@@ -198,8 +220,9 @@ async def log_requests(request: Request, call_next):
         response.headers["Access-Control-Expose-Headers"] = "*"
     
     # Log response details
-    process_time = time.time() - start_time
-    logger.info(f"Response status: {response.status_code}, time: {process_time:.3f}s")
+    if log_request:
+        process_time = time.time() - start_time
+        logger.info(f"Response status: {response.status_code}, time: {process_time:.3f}s")
     
     return response
 
@@ -308,28 +331,6 @@ async def get_rag_answer(request: RAGRequest):
         logger.error(f"Error args: {e.args}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
-@app.options("/rag/answer")
-async def options_rag_answer():
-    """
-    Handle CORS preflight request for /rag/answer
-    """
-    return {"message": "CORS preflight handled"}
-
-@app.options("/medicine-names/paginated")
-async def options_medicine_names_paginated():
-    """Handle preflight OPTIONS request for paginated medicine names."""
-    return {"message": "OK"}
-
-@app.options("/medicine-names/search")
-async def options_medicine_names_search():
-    """Handle preflight OPTIONS request for medicine names search."""
-    return {"message": "OK"}
-
-@app.options("/documents/{medicine_name}")
-async def options_documents(medicine_name: str):
-    """Handle preflight OPTIONS request for document endpoint."""
-    return {"message": "OK"}
-
 # Medicine Names Endpoints
 @app.get("/medicine-names/paginated", response_model=MedicineNamesResponse)
 async def get_paginated_medicine_names(page: int = 1, page_size: int = 20):
@@ -437,7 +438,127 @@ async def get_medicine_names_count():
         logger.error(f"Unexpected error in get_medicine_names_count: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
-# Documents Endpoint
+# Documents Endpoints
+def build_document_index(data_dir: Path) -> Dict[str, Path]:
+    """
+    Map normalized medicine names to their document files
+    
+    Args:
+        data_dir: Directory with the markdown documents
+    
+    Returns:
+        Normalized name -> file path; the first file in glob order wins, as in load_document
+    """
+    index: Dict[str, Path] = {}
+    for file_path in data_dir.glob("*.md"):
+        index.setdefault(normalize_document_name(file_path.stem.replace('_', ' ')), file_path)
+    return index
+
+def load_document(decoded_medicine_name: str, document_index: Optional[Dict[str, Path]] = None) -> DocumentResponse:
+    """
+    Find and parse the document file for a decoded medicine name
+    
+    Args:
+        decoded_medicine_name: Medicine name with URL encoding and underscores already resolved
+        document_index: Optional prebuilt index from build_document_index, used instead of
+            scanning the data directory (lets batch requests scan it once)
+    
+    Returns:
+        Document information including content, metadata, and source
+    
+    Raises:
+        HTTPException: 404 if the data directory or the document is missing
+    """
+    # Look for the document file in the data directory
+    data_dir = Path("data")
+    if not data_dir.exists():
+        raise HTTPException(status_code=404, detail="Data directory not found")
+    
+    # Find the document file that matches the medicine name
+    document_file = None
+    
+    # Normalize the requested medicine name
+    normalization_start_time = time.time()
+    normalized_requested_name = normalize_document_name(decoded_medicine_name)
+    normalization_end_time = time.time()
+    logger.info(f"Normalized requested name: '{decoded_medicine_name}' -> '{normalized_requested_name}'")
+    logger.info(f"TIMING: Name normalization time: {normalization_end_time - normalization_start_time:.3f}s")
+    
+    # Match against normalized filenames
+    file_search_start_time = time.time()
+    if document_index is not None:
+        document_file = document_index.get(normalized_requested_name)
+    else:
+        requested_first_char = normalized_requested_name[:1]
+        for file_path in data_dir.glob("*.md"):
+            # Cheap early exit: for ASCII stems the first normalized character is the
+            # first non-separator character, lowercased, so most files can be skipped
+            stem = file_path.stem
+            if stem.isascii() and stem.lstrip(_NAME_SEPARATORS)[:1].lower() != requested_first_char:
+                continue
+        
+            # Extract medicine name from filename (remove .md extension and replace underscores with spaces)
+            file_medicine_name = file_path.stem.replace('_', ' ')
+        
+            # Normalize the filename for comparison
+            normalized_filename = normalize_document_name(file_medicine_name)
+            logger.debug(f"Normalized filename: '{file_medicine_name}' -> '{normalized_filename}'")
+        
+            # Compare normalized names
+            if normalized_filename == normalized_requested_name:
+                document_file = file_path
+                break
+    file_search_end_time = time.time()
+    logger.info(f"TIMING: File search time: {file_search_end_time - file_search_start_time:.3f}s")
+    
+    if not document_file:
+        raise HTTPException(status_code=404, detail=f"Document not found for medicine: {decoded_medicine_name}")
+    
+    # Read the document content
+    file_read_start_time = time.time()
+    with open(document_file, 'r', encoding='utf-8') as f:
+        content = f.read()
+    file_read_end_time = time.time()
+    logger.info(f"TIMING: File read time: {file_read_end_time - file_read_start_time:.3f}s")
+    
+    # Parse the content to extract metadata
+    parsing_start_time = time.time()
+    lines = content.split('\n')
+    h1 = None
+    h2 = None
+    source = None
+    
+    for line in lines:
+        line = line.strip()
+        if line.startswith('# ') and not h1:
+            h1 = line[2:].strip()
+        elif line.startswith('## ') and not h2:
+            h2 = line[3:].strip()
+        elif line.startswith('## Źródło') or line.startswith('## Source'):
+            # Extract source URL from the next line or from the same line
+            if 'http' in line:
+                source = line.split('http')[1].strip()
+                if not source.startswith('s://'):
+                    source = 'http' + source
+            elif len(lines) > lines.index(line) + 1:
+                next_line = lines[lines.index(line) + 1].strip()
+                if 'http' in next_line:
+                    source = next_line.split('http')[1].strip()
+                    if not source.startswith('s://'):
+                        source = 'http' + source
+    parsing_end_time = time.time()
+    logger.info(f"TIMING: Content parsing time: {parsing_end_time - parsing_start_time:.3f}s")
+    
+    # Create response object
+    return DocumentResponse(
+        name=decoded_medicine_name,
+        filename=document_file.name,
+        source=source,
+        h1=h1,
+        h2=h2,
+        content=content
+    )
+
 @app.get("/documents/{medicine_name}", response_model=DocumentResponse)
 async def get_document(medicine_name: str):
     """
@@ -459,96 +580,66 @@ async def get_document(medicine_name: str):
         # Decode the URL-encoded medicine name and replace underscores with spaces
         decoded_medicine_name = unquote(medicine_name).replace('_', ' ')
         
-        # Look for the document file in the data directory
+        document_response = load_document(decoded_medicine_name)
+        
+        total_time = time.time() - request_start_time
+        logger.info(f"Document loaded successfully for: {decoded_medicine_name}")
+        logger.info(f"TIMING: Total document request time: {total_time:.3f}s")
+        return document_response
+        
+    except HTTPException:
+        logger.warning("HTTPException raised, re-raising")
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error in get_document: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+@app.post("/documents/batch", response_model=DocumentBatchResponse)
+def get_documents_batch(request: DocumentBatchRequest):
+    """
+    Get document content for several medicine names in one round-trip
+    
+    Declared sync so FastAPI runs the file scan and reads in its thread pool
+    instead of blocking the event loop. At most MAX_DOCUMENT_BATCH_SIZE names.
+    
+    Args:
+        request: Body with the list of (not URL-encoded) medicine names
+    
+    Returns:
+        Documents that were found, in request order, and the names that were not
+    """
+    request_start_time = time.time()
+    logger.info(f"Received batch document request for {len(request.names)} medicines")
+    
+    try:
         data_dir = Path("data")
         if not data_dir.exists():
             raise HTTPException(status_code=404, detail="Data directory not found")
         
-        # Find the document file that matches the medicine name
-        document_file = None
+        # List and normalize the document filenames once for the whole batch
+        document_index = build_document_index(data_dir)
         
-        # Normalize the requested medicine name
-        normalization_start_time = time.time()
-        normalized_requested_name = normalize_document_name(decoded_medicine_name)
-        normalization_end_time = time.time()
-        logger.info(f"Normalized requested name: '{decoded_medicine_name}' -> '{normalized_requested_name}'")
-        logger.info(f"TIMING: Name normalization time: {normalization_end_time - normalization_start_time:.3f}s")
-        
-        # Match against normalized filenames
-        file_search_start_time = time.time()
-        for file_path in data_dir.glob("*.md"):
-            # Extract medicine name from filename (remove .md extension and replace underscores with spaces)
-            file_medicine_name = file_path.stem.replace('_', ' ')
-            
-            # Normalize the filename for comparison
-            normalized_filename = normalize_document_name(file_medicine_name)
-            logger.debug(f"Normalized filename: '{file_medicine_name}' -> '{normalized_filename}'")
-            
-            # Compare normalized names
-            if normalized_filename == normalized_requested_name:
-                document_file = file_path
-                break
-        file_search_end_time = time.time()
-        logger.info(f"TIMING: File search time: {file_search_end_time - file_search_start_time:.3f}s")
-        
-        if not document_file:
-            raise HTTPException(status_code=404, detail=f"Document not found for medicine: {decoded_medicine_name}")
-        
-        # Read the document content
-        file_read_start_time = time.time()
-        with open(document_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-        file_read_end_time = time.time()
-        logger.info(f"TIMING: File read time: {file_read_end_time - file_read_start_time:.3f}s")
-        
-        # Parse the content to extract metadata
-        parsing_start_time = time.time()
-        lines = content.split('\n')
-        h1 = None
-        h2 = None
-        source = None
-        
-        for line in lines:
-            line = line.strip()
-            if line.startswith('# ') and not h1:
-                h1 = line[2:].strip()
-            elif line.startswith('## ') and not h2:
-                h2 = line[3:].strip()
-            elif line.startswith('## Źródło') or line.startswith('## Source'):
-                # Extract source URL from the next line or from the same line
-                if 'http' in line:
-                    source = line.split('http')[1].strip()
-                    if not source.startswith('s://'):
-                        source = 'http' + source
-                elif len(lines) > lines.index(line) + 1:
-                    next_line = lines[lines.index(line) + 1].strip()
-                    if 'http' in next_line:
-                        source = next_line.split('http')[1].strip()
-                        if not source.startswith('s://'):
-                            source = 'http' + source
-        parsing_end_time = time.time()
-        logger.info(f"TIMING: Content parsing time: {parsing_end_time - parsing_start_time:.3f}s")
-        
-        # Create response object
-        document_response = DocumentResponse(
-            name=decoded_medicine_name,
-            filename=document_file.name,
-            source=source,
-            h1=h1,
-            h2=h2,
-            content=content
-        )
+        results = []
+        not_found = []
+        for medicine_name in request.names:
+            decoded_medicine_name = medicine_name.replace('_', ' ')
+            try:
+                results.append(load_document(decoded_medicine_name, document_index))
+            except HTTPException as he:
+                if he.status_code != 404:
+                    raise
+                not_found.append(medicine_name)
         
         total_time = time.time() - request_start_time
-        logger.info(f"Document loaded successfully for: {decoded_medicine_name}")
-        logger.info(f"TIMING: Total document request time: {total_time:.3f}s")
-        return document_response
+        logger.info(f"Batch documents loaded: {len(results)} found, {len(not_found)} not found")
+        logger.info(f"TIMING: Total batch document request time: {total_time:.3f}s")
+        return DocumentBatchResponse(results=results, not_found=not_found)
         
     except HTTPException:
         logger.warning("HTTPException raised, re-raising")
         raise
     except Exception as e:
-        logger.error(f"Unexpected error in get_document: {str(e)}", exc_info=True)
+        logger.error(f"Unexpected error in get_documents_batch: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 # Health and Info Endpoints
@@ -632,7 +723,7 @@ async def test_simple_rag():
         
         # Test OpenAI model directly
         logger.info("Testing OpenAI model...")
-        test_response = openai_service.model.predict("Hello, this is a test.")
+        test_response = openai_service.model.invoke("Hello, this is a test.").content
         logger.info("OpenAI model test successful")
         
         return {
@@ -650,11 +741,6 @@ async def test_simple_rag():
             "error_type": type(e).__name__
         }
 
-@app.options("/debug/test-simple-rag")
-async def options_test_simple_rag():
-    """Handle preflight OPTIONS request for test endpoint."""
-    return {"message": "OK"}
-
 @app.get("/debug/postgres-info")
 async def debug_postgres_info():
     """
@@ -727,6 +813,7 @@ async def root():
             "medicine_names_search": "/medicine-names/search",
             "medicine_names_count": "/medicine-names/count",
             "documents": "/documents/{medicineName}",
+            "documents_batch": "/documents/batch",
             "test_normalize": "/test-normalize/{text}",
             "health": "/health"
         }
@@ -742,8 +829,15 @@ if __name__ == "__main__":
             logger.error("API_KEY not found! Please check your .env file.")
             exit(1)
         
-        logger.info("Service starting on http://0.0.0.0:8000")
-        uvicorn.run(app, host="0.0.0.0", port=8000)
+        logger.info(f"Service starting on http://0.0.0.0:8000 with {WORKERS} workers")
+        # Multiple workers need an import string (each worker imports the app itself);
+        # a single worker runs the already-built app instead of importing the module again
+        uvicorn.run(
+            "rag_service:app" if WORKERS > 1 else app,
+            host="0.0.0.0",
+            port=8000,
+            workers=WORKERS,
+        )
     except Exception as e:
         logger.error(f"Failed to start service: {str(e)}", exc_info=True)
         exit(1)
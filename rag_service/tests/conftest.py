@@ -0,0 +1,44 @@
+"""
+Pytest fixtures for the PharmaRAG database tests.
+
+The pytest modules (test_env.py, test_db.py, test_vector.py) wrap the checks of
+DatabaseIngestionTester. Run them from the rag_service directory, optionally in
+parallel with pytest-xdist:
+
+    pytest tests -n auto --dist=loadfile
+
+--dist=loadfile keeps each module on one worker, so its session fixtures
+(database connection, engine, vector store) are created once per module group.
+"""
+
+import pytest
+
+from .test_database_ingestion import DatabaseIngestionTester, PREFETCH_QUERIES
+
+
+@pytest.fixture(scope="session")
+def tester():
+    """A bare tester; connections are opened by the fixtures below."""
+    tester = DatabaseIngestionTester()
+    yield tester
+    tester.cleanup()
+
+
+@pytest.fixture(scope="session")
+def db_connectivity(tester):
+    """Result of the connectivity check, which opens the tester's psycopg2 connection once."""
+    return tester.test_database_connectivity()
+
+
+@pytest.fixture(scope="session")
+def db_tester(tester, db_connectivity):
+    """Tester with an open psycopg2 connection."""
+    return tester
+
+
+@pytest.fixture(scope="session")
+def vector_tester(tester):
+    """Tester with embeddings, engine and vector store initialised and query embeddings cached."""
+    tester.test_vector_store_initialization()
+    tester._embed_many(PREFETCH_QUERIES)
+    return tester
@@ -12,10 +12,81 @@ import os
 from pathlib import Path
 
 # Fix Windows console encoding issues
-if sys.platform == "win32":
-    import codecs
-    sys.stdout = codecs.getwriter("utf-8")(sys.stdout.detach())
-    sys.stderr = codecs.getwriter("utf-8")(sys.stderr.detach())
+if sys.platform == "win32" and hasattr(sys.stdout, "reconfigure"):
+    sys.stdout.reconfigure(encoding="utf-8", errors="replace")
+    sys.stderr.reconfigure(encoding="utf-8", errors="replace")
+
+# Import the test module once at startup so import errors surface early
+try:
+    from .test_database_ingestion import DatabaseIngestionTester
+    IMPORT_ERROR = None
+except ImportError as e:
+    DatabaseIngestionTester = None
+    IMPORT_ERROR = e
+
+# Tests that must pass for the quick suite to succeed
+CRITICAL_TESTS = [
+    "Environment Variables",
+    "Database Connectivity", 
+    "Document Count Check",
+    "Search Functionality"
+]
+
+def run_check_only(tester):
+    """Run only the essential connectivity tests."""
+    essential_tests = [
+        ("Environment Variables", tester.test_environment_variables),
+        ("Database Connectivity", tester.test_database_connectivity),
+        ("Document Count Check", tester.test_document_count)
+    ]
+    
+    print("Running essential connectivity tests...")
+    for test_name, test_func in essential_tests:
+        print(f"  [TEST] {test_name}")
+        try:
+            result = test_func()
+            print(f"    [PASS] PASSED")
+        except Exception as e:
+            print(f"    [FAIL] FAILED: {e}")
+            sys.exit(1)
+    
+    print("\n[SUCCESS] Database is online and has documents!")
+
+def run_quick(tester):
+    """Run the test suite and only fail on critical tests."""
+    print("Running quick test suite...")
+    results = tester.run_all_tests()
+    
+    failed_critical = any(
+        results[test]['status'] == 'FAIL' 
+        for test in CRITICAL_TESTS 
+        if test in results
+    )
+    
+    if failed_critical:
+        print("\n[FAIL] Critical tests failed!")
+        sys.exit(1)
+    else:
+        print("\n[PASS] All critical tests passed!")
+
+def run_full(tester):
+    """Run the full test suite and fail on any failed test."""
+    print("Running full test suite...")
+    results = tester.run_all_tests()
+    
+    failed_tests = sum(1 for result in results.values() if result['status'] == 'FAIL')
+    if failed_tests > 0:
+        print(f"\n[FAIL] {failed_tests} tests failed!")
+        sys.exit(1)
+    else:
+        print("\n[SUCCESS] All tests passed!")
+
+# Test plan for each run mode
+RUN_PLANS = {
+    "check": run_check_only,
+    "quick": run_quick,
+    "full": run_full,
+}
 
 def main():
     """Main function to run the database ingestion tests."""
@@ -28,6 +99,8 @@ Examples:
   python run_tests.py --verbose          # Run with verbose output
   python run_tests.py --quick            # Run only essential tests
   python run_tests.py --check-only       # Only check if database is online
+  python run_tests.py --embedding-backend local  # Embed test queries locally instead of via OpenAI
+  python run_tests.py --ingest-benchmark  # Also benchmark inserts into a scratch collection
         """
     )
     
@@ -49,6 +122,21 @@ Examples:
         help='Only check if database is online and has documents (minimal testing)'
     )
     
+    parser.add_argument(
+        '--embedding-backend',
+        choices=['openai', 'local'],
+        default=None,
+        help='Embedding backend for the tests (default: TEST_EMBEDDING_BACKEND or openai). '
+             'The local backend needs a collection ingested with all-MiniLM-L6-v2'
+    )
+    
+    parser.add_argument(
+        '--ingest-benchmark',
+        action='store_true',
+        help='Also run the ingest throughput benchmark (writes and drops a scratch collection, '
+             'embeds ~100 documents; default: TEST_INGEST_BENCHMARK)'
+    )
+    
     parser.add_argument(
         '--log-file',
         default='test_database_results.log',
@@ -57,11 +145,8 @@ Examples:
     
     args = parser.parse_args()
     
-    # Import the test module
-    try:
-        from .test_database_ingestion import DatabaseIngestionTester
-    except ImportError as e:
-        print(f"Error: Could not import test module: {e}")
+    if DatabaseIngestionTester is None:
+        print(f"Error: Could not import test module: {IMPORT_ERROR}")
         print("Make sure you're running this from the rag_service directory")
         sys.exit(1)
     
@@ -79,72 +164,24 @@ Examples:
         print("[QUICK] Running quick tests only")
     if args.check_only:
         print("[CHECK] Running minimal connectivity check only")
+    if args.embedding_backend:
+        print(f"[EMBED] Using {args.embedding_backend} embedding backend")
+    if args.ingest_benchmark:
+        print("[INGEST] Running ingest throughput benchmark")
     
     print(f"[LOG] Log file: {args.log_file}")
     print()
     
     # Create tester instance
-    tester = DatabaseIngestionTester()
+    tester = DatabaseIngestionTester(
+        embedding_backend=args.embedding_backend,
+        ingest_benchmark=args.ingest_benchmark or None,
+    )
+    
+    mode = "check" if args.check_only else "quick" if args.quick else "full"
     
     try:
-        # Run tests based on options
-        if args.check_only:
-            # Run only essential connectivity tests
-            essential_tests = [
-                ("Environment Variables", tester.test_environment_variables),
-                ("Database Connectivity", tester.test_database_connectivity),
-                ("Document Count Check", tester.test_document_count)
-            ]
-            
-            print("Running essential connectivity tests...")
-            for test_name, test_func in essential_tests:
-                print(f"  [TEST] {test_name}")
-                try:
-                    result = test_func()
-                    print(f"    [PASS] PASSED")
-                except Exception as e:
-                    print(f"    [FAIL] FAILED: {e}")
-                    sys.exit(1)
-            
-            print("\n[SUCCESS] Database is online and has documents!")
-            
-        elif args.quick:
-            # Run quick test suite
-            print("Running quick test suite...")
-            results = tester.run_all_tests()
-            
-            # Check if critical tests passed
-            critical_tests = [
-                "Environment Variables",
-                "Database Connectivity", 
-                "Document Count Check",
-                "Search Functionality"
-            ]
-            
-            failed_critical = any(
-                results[test]['status'] == 'FAIL' 
-                for test in critical_tests 
-                if test in results
-            )
-            
-            if failed_critical:
-                print("\n[FAIL] Critical tests failed!")
-                sys.exit(1)
-            else:
-                print("\n[PASS] All critical tests passed!")
-                
-        else:
-            # Run full test suite
-            print("Running full test suite...")
-            results = tester.run_all_tests()
-            
-            # Check overall status
-            failed_tests = sum(1 for result in results.values() if result['status'] == 'FAIL')
-            if failed_tests > 0:
-                print(f"\n[FAIL] {failed_tests} tests failed!")
-                sys.exit(1)
-            else:
-                print("\n[SUCCESS] All tests passed!")
+        RUN_PLANS[mode](tester)
         
     except KeyboardInterrupt:
         print("\n[STOP] Test execution interrupted by user")
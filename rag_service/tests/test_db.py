@@ -0,0 +1,15 @@
+"""PostgreSQL connectivity, extension and collection checks."""
+
+
+def test_database_connectivity(db_connectivity):
+    assert db_connectivity['connection_status'] == 'Connected'
+
+
+def test_postgresql_extensions(db_tester):
+    result = db_tester.test_postgresql_extensions()
+    assert result['extensions']['vector']
+
+
+def test_document_count(vector_tester):
+    result = vector_tester.test_document_count()
+    assert result['has_documents']
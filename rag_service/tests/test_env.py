@@ -0,0 +1,11 @@
+"""Environment and data directory checks (no database needed)."""
+
+
+def test_environment_variables(tester):
+    result = tester.test_environment_variables()
+    assert not result['missing_variables']
+
+
+def test_data_directory(tester):
+    result = tester.test_data_directory()
+    assert result['data_directory_exists']
@@ -0,0 +1,37 @@
+"""Embedding, vector search and pgvector performance checks."""
+
+import pytest
+
+
+def test_vector_store_initialization(vector_tester):
+    assert vector_tester.vector_store is not None
+    assert vector_tester.engine is not None
+
+
+def test_vector_embeddings(vector_tester):
+    result = vector_tester.test_vector_embeddings()
+    assert result['embedding_dimension'] > 0
+
+
+def test_search_functionality(vector_tester):
+    result = vector_tester.test_search_functionality()
+    assert result['search_functionality_working']
+
+
+def test_sample_document_retrieval(vector_tester):
+    result = vector_tester.test_sample_document_retrieval()
+    assert result['sample_documents_found'] > 0
+
+
+# Timing tests come last in the module so they run after the searches above on this worker
+def test_performance_metrics(vector_tester):
+    result = vector_tester.test_performance_metrics()
+    assert result['performance_acceptable']
+    assert result['embedding_performance_acceptable']
+
+
+def test_ingest_throughput(vector_tester):
+    if not vector_tester.ingest_benchmark:
+        pytest.skip("ingest benchmark is opt-in; set TEST_INGEST_BENCHMARK=1")
+    result = vector_tester.test_ingest_throughput()
+    assert result['documents_ingested'] > 0
@@ -0,0 +1,37 @@
+"""Parsing checks for the mp.pl scraper (offline, on a fixture page)."""
+
+from preprocessing.web_scraper import (
+    convert_article_to_markdown,
+    extract_drug_description,
+    extract_main_container,
+    parse_medicine_page,
+)
+
+MEDICINE_PAGE = """
+<html><body>
+<h1>Apap</h1>
+<div class="drug-description">
+  <h3><p>Lek przeciwbólowy i przeciwgorączkowy<br>zawierający paracetamol</p></h3>
+  <h3>Substancja czynna: <a href="/pacjent/leki/subst.html">paracetamol</a></h3>
+  <h2>Wskazania</h2>
+  <div class="item-content"><p>Bóle głowy.</p></div>
+</div>
+</body></html>
+""".encode("utf-8")
+
+
+def test_drug_description_from_h3_with_paragraph():
+    soup = parse_medicine_page(MEDICINE_PAGE, "utf-8")
+    description = extract_drug_description(extract_main_container(soup))
+    assert description == (
+        "Lek przeciwbólowy i przeciwgorączkowy zawierający paracetamol\n"
+        "Substancja czynna: paracetamol"
+    )
+
+
+def test_markdown_includes_drug_description():
+    soup = parse_medicine_page(MEDICINE_PAGE, "utf-8")
+    title, markdown = convert_article_to_markdown(soup, "https://www.mp.pl/pacjent/leki/lek/1,apap.html")
+    assert title == "Apap"
+    assert "Lek przeciwbólowy i przeciwgorączkowy zawierający paracetamol" in markdown
+    assert "## Wskazania\n\nBóle głowy." in markdown
@@ -12,6 +12,8 @@ from typing import Set, List
 # Constants
 CHROMA_DB_PATH = "chroma/chroma.sqlite3"
 JSON_FILE_PATH = "medicine_names_minimal.json"
+SQLITE_MMAP_SIZE = 256 * 1024 * 1024  # 256 MiB
+SQLITE_CACHE_SIZE = -64 * 1024  # 64 MiB (negative values are KiB)
 
 def extract_h1_values_from_chroma() -> Set[str]:
     """
@@ -26,29 +28,40 @@ def extract_h1_values_from_chroma() -> Set[str]:
         raise FileNotFoundError(f"Chroma database not found at {CHROMA_DB_PATH}")
     
     h1_values = set()
+    conn = None
     
     try:
-        # Connect to the SQLite database
-        conn = sqlite3.connect(CHROMA_DB_PATH)
+        # Open the SQLite database read-only so we never take write locks,
+        # and let SQLite read pages through mmap with a larger page cache
+        conn = sqlite3.connect(Path(CHROMA_DB_PATH).resolve().as_uri() + "?mode=ro", uri=True)
+        conn.execute("PRAGMA query_only = ON")
+        conn.execute(f"PRAGMA mmap_size = {SQLITE_MMAP_SIZE}")
+        conn.execute(f"PRAGMA cache_size = {SQLITE_CACHE_SIZE}")
+        conn.execute("PRAGMA temp_store = MEMORY")
         cursor = conn.cursor()
         
-        # Query to get all unique h1 values from the embedding_metadata table
-        # Chroma stores metadata as key-value pairs in embedding_metadata table
+        # Query to get all unique, trimmed h1 values from the embedding_metadata table.
+        # Chroma stores metadata as key-value pairs in embedding_metadata table;
+        # trimming and de-duplication both happen inside SQLite
         query = """
-        SELECT DISTINCT string_value as h1_value
+        SELECT DISTINCT TRIM(string_value, char(32, 9, 10, 13)) AS h1_value
         FROM embedding_metadata
         WHERE key = 'h1' 
         AND string_value IS NOT NULL 
-        AND string_value != ''
+        AND TRIM(string_value, char(32, 9, 10, 13)) != ''
         """
         
-        cursor.execute(query)
-        results = cursor.fetchall()
+        # Suggest an index if the h1 lookup has to scan the whole table
+        plan = conn.execute("EXPLAIN QUERY PLAN " + query).fetchall()
+        if any(row[3].startswith("SCAN") and "INDEX" not in row[3] for row in plan):
+            print("Hint: embedding_metadata is scanned in full; consider running offline:")
+            print("  CREATE INDEX IF NOT EXISTS embedding_metadata_key_string_value "
+                  "ON embedding_metadata (key, string_value);")
         
-        for row in results:
-            h1_value = row[0]
-            if h1_value and h1_value.strip():
-                h1_values.add(h1_value.strip())
+        cursor.arraysize = 10000
+        cursor.execute(query)
+        while rows := cursor.fetchmany():
+            h1_values.update(row[0] for row in rows)
         
         print(f"Found {len(h1_values)} unique h1 values from database")
         
@@ -84,29 +97,29 @@ def save_json_with_h1_values(h1_values: Set[str], json_data: dict) -> None:
         json_data: Existing JSON data
     """
     # Convert set to sorted list for consistent ordering
-    h1_list = sorted(list(h1_values))
+    h1_list = sorted(h1_values)
     
     # Update the names field
     json_data["names"] = h1_list
     
-    # Save to file
+    # Save to file as compact JSON: json.dumps without indent is encoded by the
+    # C accelerator in one pass (json.dump with indent falls back to pure Python)
     with open(JSON_FILE_PATH, 'w', encoding='utf-8') as f:
-        json.dump(json_data, f, ensure_ascii=False, indent=2)
+        f.write(json.dumps(json_data, ensure_ascii=False, separators=(',', ':')))
     
     print(f"Successfully saved {len(h1_list)} h1 values to {JSON_FILE_PATH}")
 
 def main():
     """Main function to extract h1 values and update JSON file."""
     try:
-        # Check if Chroma database exists
-        if not os.path.exists(CHROMA_DB_PATH):
-            print(f"Error: Chroma database not found at {CHROMA_DB_PATH}")
+        # Extract h1 values from Chroma (raises FileNotFoundError if the database is missing)
+        try:
+            h1_values = extract_h1_values_from_chroma()
+        except FileNotFoundError as e:
+            print(f"Error: {e}")
             print("Please ensure the Chroma database exists before running this script.")
             return
         
-        # Extract h1 values from Chroma
-        h1_values = extract_h1_values_from_chroma()
-        
         if not h1_values:
             print("No h1 values found in the Chroma database")
             return